@@ -1,9 +1,12 @@
-import json
+import asyncio
+import functools
 import logging
 import os
+import random
 import sys
 import telegram
 import time
+import orjson
 import requests
 
 from dotenv import load_dotenv
@@ -23,8 +26,22 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_TIME = 600
+BASE_BACKOFF = 5
+MAX_BACKOFF = 600
+MAX_ATTEMPT = 10
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+REQUEST_TIMEOUT = (5, 30)
+
+SESSION = requests.Session()
+SESSION.mount(
+    'https://',
+    requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1),
+)
+
+MESSAGE_MAX_LENGTH = 4000
+ERROR_SIGNATURE_LENGTH = 200
+RECOVERY_MESSAGE = 'Работа программы восстановлена после сбоя.'
 
 HOMEWORK_STATUSES = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -33,37 +50,47 @@ HOMEWORK_STATUSES = {
 }
 
 
-def send_message(bot: telegram.Bot, message: str) -> None:
+async def send_message(bot: telegram.Bot, message: str) -> None:
     """Отправить сообщение в Telegram."""
     try:
-        logging.debug('Старт отправки сообщения в Telegram: {message}')
-        bot.send_message(TELEGRAM_CHAT_ID, message)
+        logging.debug('Старт отправки сообщения в Telegram: %s', message)
+        await bot.send_message(TELEGRAM_CHAT_ID, message)
     except telegram.error.TelegramError as error:
         raise TelegramError(
             f"Ошибка при отправке сообщения {message} "
             f"в чат {TELEGRAM_CHAT_ID} Telegram") from error
     else:
         logging.info(
-            f"Сообщение '{message}' успешно отправлено "
-            f"в чат Telegram {TELEGRAM_CHAT_ID}")
+            "Сообщение '%s' успешно отправлено в чат Telegram %s",
+            message, TELEGRAM_CHAT_ID)
+
+
+async def send_messages(
+    bot: telegram.Bot, messages: list, sent_messages: set
+) -> None:
+    """Отправить сообщения в Telegram, объединив их в пакеты.
+
+    Сообщения каждого доставленного пакета добавляются в sent_messages.
+    """
+    for batch in join_messages(messages):
+        await send_message(bot, truncate_message('\n\n'.join(batch)))
+        sent_messages.update(batch)
 
 
 def get_api_answer(current_timestamp: int) -> dict:
     """Запросить статус проверки проектных работ Яндекс.Практикума."""
     timestamp = current_timestamp or int(time.time())
-    request_params = {
-        'url': ENDPOINT,
-        'headers': HEADERS,
-        'params': {
-            'from_date': timestamp,
-        },
-    }
 
     try:
         logging.debug(
-            "Отправка запроса к API сервиса Практикум.Домашка"
-            f"Параметры запроса: {request_params}.")
-        response = requests.get(**request_params)
+            "Отправка запроса к API сервиса Практикум.Домашка. "
+            "Параметры запроса: from_date = %s.", timestamp)
+        response = SESSION.get(
+            ENDPOINT,
+            headers=HEADERS,
+            params={'from_date': timestamp},
+            timeout=REQUEST_TIMEOUT,
+        )
 
         if response.status_code != HTTPStatus.OK:
             raise APIStatusCodeError(
@@ -72,19 +99,19 @@ def get_api_answer(current_timestamp: int) -> dict:
                 f'reason = {response.reason}; '
                 f'content = {response.text}')
 
-        response = response.json()
+        homework_statuses = orjson.loads(response.content)
     except requests.exceptions.RequestException as error:
         raise APIResponseError(
             f"Ошибка подключения к API сервиса Практикум.Домашка: {error}. "
-            f"Параметры запроса: {request_params}.") from error
-    except json.JSONDecodeError as error:
+            f"Параметры запроса: from_date = {timestamp}.") from error
+    except orjson.JSONDecodeError as error:
         raise APIResponseError(
             f"Ошибка при декодировании ответа API сервиса: {error}. "
-            f"Параметры запроса: {request_params}.") from error
+            f"Параметры запроса: from_date = {timestamp}.") from error
     else:
         logging.debug("Получен ответ от API сервиса Практикум.Домашка")
 
-    return response
+    return homework_statuses
 
 
 def check_response(response: dict) -> list:
@@ -123,20 +150,111 @@ def parse_status(homework: dict) -> str:
             f'homework = {homework}')
         raise KeyError(message)
 
-    verdict = HOMEWORK_STATUSES.get(status)
-    if verdict is None:
+    if status not in HOMEWORK_STATUSES:
         raise TypeError(
             f"Неизвестный статус домашней работы: {status}")
 
+    return _format_status(name, status)
+
+
+@functools.lru_cache(maxsize=512)
+def _format_status(name: str, status: str) -> str:
+    """Сформировать сообщение об изменении статуса проектной работы."""
+    verdict = HOMEWORK_STATUSES[status]
     return f'Изменился статус проверки работы "{name}". {verdict}'
 
 
+def filter_new_messages(messages: list, sent_messages: set) -> list:
+    """Отобрать сообщения, не отправленные на прошлой итерации."""
+    return [message for message in messages if message not in sent_messages]
+
+
+def join_messages(messages: list) -> list:
+    """Разбить сообщения на пакеты не длиннее MESSAGE_MAX_LENGTH."""
+    batches = []
+    length = 0
+    for message in messages:
+        if batches and length + len(message) + 2 <= MESSAGE_MAX_LENGTH:
+            batches[-1].append(message)
+            length += len(message) + 2
+        else:
+            batches.append([message])
+            length = len(message)
+    return batches
+
+
+def truncate_message(message: str) -> str:
+    """Обрезать сообщение до MESSAGE_MAX_LENGTH символов."""
+    if len(message) <= MESSAGE_MAX_LENGTH:
+        return message
+    return message[:MESSAGE_MAX_LENGTH - 1] + '…'
+
+
 def check_tokens() -> bool:
     """Проверить доступность переменных окружения."""
     return all([PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID])
 
 
-def main() -> None:
+def should_notify(error_message: str, last_error_message: str) -> bool:
+    """Проверить, отличается ли ошибка от последней отправленной."""
+    return (error_message[:ERROR_SIGNATURE_LENGTH]
+            != last_error_message[:ERROR_SIGNATURE_LENGTH])
+
+
+async def notify_error(
+    bot: telegram.Bot, error_message: str, last_error_message: str
+) -> str:
+    """Сообщить об ошибке в Telegram, если она ещё не отправлялась.
+
+    Возвращает последнюю доставленную ошибку.
+    """
+    if not should_notify(error_message, last_error_message):
+        return last_error_message
+    try:
+        await send_message(bot, error_message)
+    except TelegramError as error:
+        logging.error("Ошибка в работе телеграм-бота: %s", error)
+        return last_error_message
+    return error_message
+
+
+async def notify_recovery(bot: telegram.Bot, last_error_message: str) -> str:
+    """Сообщить в Telegram о восстановлении работы после ошибки.
+
+    Возвращает последнюю доставленную ошибку: пустую строку, если
+    сообщение о восстановлении доставлено или не требовалось.
+    """
+    if not last_error_message:
+        return last_error_message
+    try:
+        await send_message(bot, RECOVERY_MESSAGE)
+    except TelegramError as error:
+        logging.error("Ошибка в работе телеграм-бота: %s", error)
+        return last_error_message
+    return ""
+
+
+def get_retry_delay(attempt: int) -> float:
+    """Вычислить задержку перед повторным запросом после сбоя."""
+    return random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt))
+
+
+async def init_bot() -> telegram.Bot:
+    """Создать и подключить бота Telegram."""
+    bot = telegram.Bot(token=TELEGRAM_TOKEN)
+    try:
+        await bot.initialize()
+    except telegram.error.TelegramError as error:
+        error_message = (
+            f'Не удалось подключиться к Telegram: {error}. '
+            'Программа принудительно остановлена.'
+        )
+        logging.critical(error_message)
+        sys.exit(error_message)
+    return bot
+
+
+async def main() -> None:
     """Основная логика работы бота."""
     if not check_tokens():
         error_message = (
@@ -147,23 +265,34 @@ def main() -> None:
         logging.critical(error_message)
         sys.exit(error_message)
 
-    bot = telegram.Bot(token=TELEGRAM_TOKEN)
+    bot = await init_bot()
     current_timestamp = int(time.time())
+    attempt = 0
+    sent_verdicts = set()
+    last_error_message = ""
 
     while True:
         error_message = ""
         try:
-            response = get_api_answer(current_timestamp)
+            response = await asyncio.to_thread(
+                get_api_answer, current_timestamp)
             homeworks = check_response(response)
 
             if not homeworks:
                 logging.debug("В ответе API отсутствуют новые статусы.")
 
-            for homework in homeworks:
-                verdict = parse_status(homework)
-                send_message(bot, verdict)
+            verdicts = [parse_status(homework) for homework in homeworks]
+            await send_messages(
+                bot, filter_new_messages(verdicts, sent_verdicts),
+                sent_verdicts)
+            sent_verdicts = set(verdicts)
+
+            current_timestamp = (
+                response.get('current_date') or int(time.time()))
+            attempt = 0
 
-            current_timestamp = int(time.time())
+            last_error_message = await notify_recovery(
+                bot, last_error_message)
         except TelegramError as error:
             error_message = f"Ошибка в работе телеграм-бота: {error}"
         except (APIResponseError, APIStatusCodeError) as error:
@@ -174,13 +303,13 @@ def main() -> None:
             error_message = f'Непредвиденный сбой в работе программы: {error}'
         finally:
             if error_message:
+                attempt = min(attempt + 1, MAX_ATTEMPT)
                 logging.error(error_message)
-                try:
-                    send_message(bot, error_message)
-                except TelegramError as error:
-                    logging.error(f"Ошибка в работе телеграм-бота: {error}")
+                last_error_message = await notify_error(
+                    bot, error_message, last_error_message)
 
-            time.sleep(RETRY_TIME)
+            delay = get_retry_delay(attempt) if error_message else RETRY_TIME
+            await asyncio.sleep(delay)
 
 
 if __name__ == '__main__':
@@ -197,4 +326,4 @@ if __name__ == '__main__':
         ],
     )
 
-    main()
+    asyncio.run(main())
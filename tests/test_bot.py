@@ -1,7 +1,8 @@
+import asyncio
+import json
 import os
 from http import HTTPStatus
 
-import requests
 import telegram
 import utils
 
@@ -52,16 +53,23 @@ class MockResponseGET:
         }
         return data
 
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode()
+
 
 class MockTelegramBot:
 
-    def __init__(self, token=None, random_timestamp=None, **kwargs):
+    def __init__(self, token=None, random_timestamp=None, fail=None,
+                 **kwargs):
         assert token is not None, (
             'Проверьте, что вы передали токен бота Telegram'
         )
         self.random_timestamp = random_timestamp
+        self.fail = fail
+        self.sent = []
 
-    def send_message(self, chat_id=None, text=None, **kwargs):
+    async def send_message(self, chat_id=None, text=None, **kwargs):
         assert chat_id is not None, (
             'Проверьте, что вы передали chat_id= при отправке '
             'сообщения ботом Telegram'
@@ -70,6 +78,9 @@ class MockTelegramBot:
             'Проверьте, что вы передали text= при отправке '
             'сообщения ботом Telegram'
         )
+        if self.fail is not None and self.fail(text):
+            raise telegram.error.NetworkError('network error')
+        self.sent.append(text)
         return self.random_timestamp
 
 
@@ -186,7 +197,7 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_response_get)
 
         import homework
 
@@ -232,7 +243,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_500_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_500_response_get)
 
         import homework
 
@@ -247,6 +258,179 @@ class TestHomework:
                 'когда API возвращает код, отличный от 200'
             )
 
+    def test_get_retry_delay(self, monkeypatch):
+        import homework
+
+        func_name = 'get_retry_delay'
+        utils.check_function(homework, func_name, 1)
+
+        for attempt in range(homework.MAX_ATTEMPT + 1):
+            upper = min(
+                homework.MAX_BACKOFF, homework.BASE_BACKOFF * 2 ** attempt)
+            assert 0 <= homework.get_retry_delay(attempt) <= upper, (
+                f'Проверьте, что функция `{func_name}` возвращает задержку '
+                'в пределах экспоненциально растущего интервала'
+            )
+
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: b)
+        assert (homework.get_retry_delay(homework.MAX_ATTEMPT)
+                == homework.MAX_BACKOFF), (
+            f'Проверьте, что функция `{func_name}` ограничивает задержку '
+            'значением `MAX_BACKOFF`'
+        )
+
+    def test_should_notify(self):
+        import homework
+
+        func_name = 'should_notify'
+        utils.check_function(homework, func_name, 2)
+
+        api_error = 'Ошибка в работе API сервиса: http code = 500'
+        format_error = 'Некорректный формат ответа API сервиса: homeworks'
+        assert homework.should_notify(api_error, ''), (
+            f'Проверьте, что функция `{func_name}` разрешает отправку '
+            'первой ошибки'
+        )
+        assert not homework.should_notify(api_error, api_error), (
+            f'Проверьте, что функция `{func_name}` подавляет '
+            'повторную ошибку'
+        )
+        assert homework.should_notify(format_error, api_error), (
+            f'Проверьте, что функция `{func_name}` разрешает отправку '
+            'новой ошибки'
+        )
+        long_error = api_error + 'x' * homework.ERROR_SIGNATURE_LENGTH
+        assert not homework.should_notify(long_error + '1', long_error), (
+            f'Проверьте, что функция `{func_name}` сравнивает только '
+            'начало сообщения об ошибке'
+        )
+
+    def test_notify_error(self, monkeypatch, random_timestamp):
+        import homework
+
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        func_name = 'notify_error'
+        api_error = 'Ошибка в работе API сервиса: http code = 500'
+        bot = MockTelegramBot(token='1234:abcdefg',
+                              random_timestamp=random_timestamp,
+                              fail=lambda text: True)
+
+        last_error = asyncio.run(homework.notify_error(bot, api_error, ''))
+        assert last_error == '', (
+            f'Убедитесь, что функция `{func_name}` не запоминает ошибку, '
+            'которую не удалось отправить'
+        )
+
+        bot.fail = None
+        last_error = asyncio.run(
+            homework.notify_error(bot, api_error, last_error))
+        assert bot.sent == [api_error] and last_error == api_error, (
+            f'Убедитесь, что функция `{func_name}` повторно отправляет '
+            'ошибку, которую не удалось доставить'
+        )
+
+        last_error = asyncio.run(
+            homework.notify_error(bot, api_error, last_error))
+        assert bot.sent == [api_error], (
+            f'Убедитесь, что функция `{func_name}` не отправляет '
+            'повторную ошибку'
+        )
+
+    def test_notify_recovery(self, monkeypatch, random_timestamp):
+        import homework
+
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        func_name = 'notify_recovery'
+        api_error = 'Ошибка в работе API сервиса: http code = 500'
+        bot = MockTelegramBot(token='1234:abcdefg',
+                              random_timestamp=random_timestamp,
+                              fail=lambda text: True)
+
+        last_error = asyncio.run(homework.notify_recovery(bot, api_error))
+        assert last_error == api_error, (
+            f'Убедитесь, что функция `{func_name}` не выбрасывает ошибку '
+            'и сохраняет последнюю ошибку, если сообщение не доставлено'
+        )
+
+        bot.fail = None
+        last_error = asyncio.run(homework.notify_recovery(bot, last_error))
+        last_error = asyncio.run(homework.notify_recovery(bot, last_error))
+        assert bot.sent == [homework.RECOVERY_MESSAGE] and not last_error, (
+            f'Убедитесь, что функция `{func_name}` сообщает о '
+            'восстановлении работы один раз'
+        )
+
+    def test_main_loop(self, monkeypatch, random_timestamp):
+        import homework
+
+        class StopLoop(Exception):
+            pass
+
+        reviewing = {'homework_name': 'hw123', 'status': 'reviewing'}
+        approved = {'homework_name': 'hw123', 'status': 'approved'}
+        api_error = homework.APIResponseError('http code = 500')
+        answers = [
+            {'homeworks': [reviewing], 'current_date': 1},
+            api_error,
+            api_error,
+            {'homeworks': [reviewing], 'current_date': 0},
+            {'homeworks': [approved], 'current_date': 3},
+        ]
+        from_dates = []
+        delays = []
+        bot = MockTelegramBot(token='1234:abcdefg',
+                              random_timestamp=random_timestamp)
+
+        def mock_get_api_answer(current_timestamp):
+            from_dates.append(current_timestamp)
+            answer = answers[len(from_dates) - 1]
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        async def mock_init_bot():
+            return bot
+
+        async def mock_sleep(delay):
+            delays.append(delay)
+            if len(delays) == len(answers):
+                raise StopLoop
+
+        for name, value in (('PRACTICUM_TOKEN', 'sometoken'),
+                            ('TELEGRAM_TOKEN', '1234:abcdefg'),
+                            ('TELEGRAM_CHAT_ID', 12345)):
+            monkeypatch.setattr(homework, name, value)
+        monkeypatch.setattr(homework, 'init_bot', mock_init_bot)
+        monkeypatch.setattr(homework, 'get_api_answer', mock_get_api_answer)
+        monkeypatch.setattr(homework.asyncio, 'sleep', mock_sleep)
+        monkeypatch.setattr(homework.time, 'time', lambda: 2000)
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: b)
+
+        try:
+            asyncio.run(homework.main())
+        except StopLoop:
+            pass
+
+        assert from_dates == [2000, 1, 1, 1, 2000], (
+            'Убедитесь, что `main` запрашивает статусы начиная с '
+            '`current_date` из прошлого ответа API, а при его отсутствии '
+            'использует текущее время'
+        )
+        assert bot.sent == [
+            homework.parse_status(reviewing),
+            f'Ошибка в работе API сервиса: {api_error}',
+            homework.RECOVERY_MESSAGE,
+            homework.parse_status(approved),
+        ], (
+            'Убедитесь, что `main` не отправляет повторно статусы и ошибки, '
+            'и сообщает о восстановлении работы один раз'
+        )
+        retry_time = homework.RETRY_TIME
+        assert delays == [retry_time, 10, 20, retry_time, retry_time], (
+            'Убедитесь, что `main` увеличивает задержку после сбоев '
+            'и сбрасывает её после успешного запроса'
+        )
+
     def test_parse_status(self, random_timestamp):
         test_data = {
             "id": 123,
@@ -291,6 +475,125 @@ class TestHomework:
             f'`{status}` в возврате функции parse_status()'
         )
 
+    def test_parse_status_errors_not_cached(self):
+        import homework
+
+        func_name = 'parse_status'
+        test_data = {'homework_name': 'hw123', 'status': 'unknown'}
+        for _ in range(2):
+            try:
+                homework.parse_status(test_data)
+            except TypeError:
+                pass
+            else:
+                assert False, (
+                    f'Убедитесь, что функция `{func_name}` выбрасывает '
+                    'ошибку при каждом вызове с недокументированным статусом'
+                )
+
+    def test_parse_status_cached(self, random_timestamp):
+        import homework
+
+        func_name = 'parse_status'
+        test_data = {
+            'homework_name': str(random_timestamp),
+            'status': 'approved',
+        }
+        first = homework.parse_status(test_data)
+        hits = homework._format_status.cache_info().hits
+        second = homework.parse_status(dict(test_data))
+        assert second is first, (
+            f'Проверьте, что функция `{func_name}` возвращает '
+            'закешированное сообщение для того же статуса'
+        )
+        assert homework._format_status.cache_info().hits == hits + 1, (
+            f'Проверьте, что функция `{func_name}` использует кеш '
+            'для повторного статуса'
+        )
+
+    def test_filter_new_messages(self):
+        import homework
+
+        func_name = 'filter_new_messages'
+        utils.check_function(homework, func_name, 2)
+
+        sent = {'hw1 reviewing', 'hw2 approved'}
+        messages = ['hw1 approved', 'hw2 approved', 'hw3 reviewing']
+        assert homework.filter_new_messages(messages, sent) == [
+            'hw1 approved', 'hw3 reviewing'
+        ], (
+            f'Проверьте, что функция `{func_name}` пропускает сообщения, '
+            'отправленные на прошлой итерации'
+        )
+        assert homework.filter_new_messages(messages, set()) == messages, (
+            f'Проверьте, что функция `{func_name}` не пропускает новые '
+            'сообщения'
+        )
+
+    def test_join_messages(self):
+        import homework
+
+        func_name = 'join_messages'
+        utils.check_function(homework, func_name, 1)
+
+        messages = ['first', 'second']
+        assert homework.join_messages(messages) == [messages], (
+            f'Проверьте, что функция `{func_name}` объединяет статусы '
+            'в один пакет'
+        )
+        assert homework.join_messages(['first']) == [['first']], (
+            f'Проверьте, что функция `{func_name}` не изменяет '
+            'единственное сообщение'
+        )
+
+        long_messages = ['a' * 3000, 'b' * 3000, 'c' * 900]
+        result = homework.join_messages(long_messages)
+        assert result == [['a' * 3000], ['b' * 3000, 'c' * 900]], (
+            f'Проверьте, что функция `{func_name}` не создает пакеты '
+            'длиннее `MESSAGE_MAX_LENGTH`'
+        )
+
+    def test_truncate_message(self):
+        import homework
+
+        func_name = 'truncate_message'
+        utils.check_function(homework, func_name, 1)
+
+        assert homework.truncate_message('short') == 'short', (
+            f'Проверьте, что функция `{func_name}` не изменяет '
+            'короткие сообщения'
+        )
+        result = homework.truncate_message('a' * 5000)
+        assert len(result) == homework.MESSAGE_MAX_LENGTH, (
+            f'Проверьте, что функция `{func_name}` обрезает сообщения '
+            'до `MESSAGE_MAX_LENGTH`'
+        )
+
+    def test_send_messages_partial_failure(self, monkeypatch,
+                                           random_timestamp):
+        import homework
+
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        func_name = 'send_messages'
+        messages = ['a' * 3000, 'b' * 3000]
+        bot = MockTelegramBot(token='1234:abcdefg',
+                              random_timestamp=random_timestamp,
+                              fail=lambda text: text.startswith('b'))
+        sent_messages = set()
+        try:
+            asyncio.run(homework.send_messages(bot, messages, sent_messages))
+        except homework.TelegramError:
+            pass
+        else:
+            assert False, (
+                f'Убедитесь, что функция `{func_name}` выбрасывает ошибку, '
+                'если часть сообщений не удалось отправить'
+            )
+        assert sent_messages == {'a' * 3000}, (
+            f'Убедитесь, что функция `{func_name}` отмечает сообщения '
+            'из доставленных пакетов'
+        )
+
     def test_check_response(self, monkeypatch, random_timestamp,
                             current_timestamp, api_url):
         def mock_response_get(*args, **kwargs):
@@ -315,7 +618,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_response_get)
 
         import homework
 
@@ -352,7 +655,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_response_get)
 
         import homework
 
@@ -400,7 +703,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_response_get)
 
         import homework
 
@@ -448,7 +751,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_response_get)
 
         import homework
 
@@ -484,7 +787,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_no_homeworks_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_no_homeworks_response_get)
 
         import homework
 
@@ -525,7 +828,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_response_get)
 
         import homework
 
@@ -565,7 +868,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_response_get)
 
         import homework
 
@@ -599,7 +902,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_empty_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_empty_response_get)
 
         import homework
 
@@ -626,7 +929,7 @@ class TestHomework:
             )
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr('homework.SESSION.get', mock_response_get)
 
         import homework
 